@@ -0,0 +1,69 @@
+"""
+Worst-case edit relight benchmark for lighting.LightEngine.
+
+Builds a sealed cave inside solid stone and times the edits that touch the most light:
+adding/removing a lamp in the middle of the cave, and opening/sealing a skylight shaft that
+floods the cave with sunlight. Run with: python bench_lighting.py
+"""
+import time
+from lighting import LightEngine
+from utils import CHUNK_SIZE, LIGHT_MIN_Y, LIGHT_MAX_Y, BLOCK_AIR, BLOCK_STONE, BLOCK_LAMP
+
+CHUNK_RADIUS = 3   # Loaded chunks around the origin
+CAVE_HALF = 16     # Cave spans -CAVE_HALF..CAVE_HALF on x and z
+CAVE_TOP = 20      # Cave spans y = 1..CAVE_TOP
+REPEATS = 20
+
+def is_solid(wx, y, wz):
+    in_cave = abs(wx) <= CAVE_HALF and abs(wz) <= CAVE_HALF and 1 <= y <= CAVE_TOP
+    in_shaft = wx == 0 and wz == 0 and y > CAVE_TOP
+    return not (in_cave or in_shaft)
+
+def build_engine():
+    engine = LightEngine()
+    for cx in range(-CHUNK_RADIUS, CHUNK_RADIUS + 1):
+        for cz in range(-CHUNK_RADIUS, CHUNK_RADIUS + 1):
+            chunk_data = {}
+            for bx in range(CHUNK_SIZE):
+                for bz in range(CHUNK_SIZE):
+                    wx, wz = cx * CHUNK_SIZE + bx, cz * CHUNK_SIZE + bz
+                    for y in range(LIGHT_MIN_Y, LIGHT_MAX_Y + 1):
+                        if is_solid(wx, y, wz):
+                            chunk_data[(bx, y, bz)] = BLOCK_STONE
+            engine.light_chunk(cx, cz, chunk_data)
+    engine.pop_dirty_chunks()
+    return engine
+
+def time_edit(engine, pos, block_type):
+    start = time.perf_counter()
+    engine.set_block(pos, block_type)
+    elapsed = time.perf_counter() - start
+    touched = len(engine.pop_dirty_chunks())
+    return elapsed, touched
+
+def run_case(name, engine, pos, first, second):
+    results = {first: [], second: []}
+    touched = {}
+    for _ in range(REPEATS):
+        for block_type in (first, second):
+            elapsed, touched[block_type] = time_edit(engine, pos, block_type)
+            results[block_type].append(elapsed)
+    for block_type, times in results.items():
+        times.sort()
+        label = "air" if block_type == BLOCK_AIR else f"block {block_type}"
+        print(f"{name:<28} -> {label:<9} median {times[len(times) // 2] * 1000:7.2f} ms"
+              f"  max {times[-1] * 1000:7.2f} ms  chunks remeshed {touched[block_type]}")
+
+def main():
+    start = time.perf_counter()
+    engine = build_engine()
+    chunks = (2 * CHUNK_RADIUS + 1) ** 2
+    print(f"Initial light for {chunks} chunks: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    run_case("lamp in cave", engine, (0, CAVE_TOP // 2, 0), BLOCK_LAMP, BLOCK_AIR)
+    # The shaft starts open, so sealing it first darkens the whole cave, then reopening floods it
+    run_case("seal/open skylight shaft", engine, (0, LIGHT_MAX_Y, 0), BLOCK_STONE, BLOCK_AIR)
+    run_case("seal/open shaft at cave roof", engine, (0, CAVE_TOP + 1, 0), BLOCK_STONE, BLOCK_AIR)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import heapq
+import random
+from itertools import count
+from time import perf_counter
+from utils import (chunk_coords, TICK_RATE, MAX_TICKS_PER_FRAME, MAX_BLOCK_UPDATES_PER_TICK, MAX_TICK_SECONDS,
+                   BLOCK_AIR, BLOCK_GRASS, BLOCK_DIRT, BLOCK_SAND, BLOCK_GRAVEL, BLOCK_WATER)
+
+NEIGHBOURS = ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1))
+SIDES = ((1, 0, 0), (-1, 0, 0), (0, 0, 1), (0, 0, -1))
+
+FALL_DELAY = 2           # Ticks per block fallen by sand/gravel
+WATER_FLOW_DELAY = 5     # Ticks before water flows one block further
+GRASS_SPREAD_DELAY = (40, 160)  # Random tick range before dirt turns to grass (or grass back to dirt)
+WATER_SOURCE_LEVEL = 8   # Player-placed water; flowing water runs WATER_SOURCE_LEVEL - 1 .. 1
+FALLING_BLOCKS = {BLOCK_SAND, BLOCK_GRAVEL}
+
+def _offset(pos, d):
+    return (pos[0] + d[0], pos[1] + d[1], pos[2] + d[2])
+
+class BlockTicks:
+    """
+    Fixed-rate scheduler for dynamic blocks (falling sand/gravel, spreading grass, flowing water).
+    Only positions that were scheduled - by an edit next to them or by their own rule - are ever
+    visited, so the cost follows the number of active blocks rather than the loaded world.
+    Edits made during a tick are applied to the terrain immediately and each touched chunk is
+    remeshed once per update() call, however many ticks it ran.
+    """
+    def __init__(self, terrain, tick_rate=TICK_RATE, max_updates_per_tick=MAX_BLOCK_UPDATES_PER_TICK,
+                 max_tick_seconds=MAX_TICK_SECONDS):
+        self.terrain = terrain
+        self.tick_interval = 1.0 / tick_rate
+        self.max_updates_per_tick = max_updates_per_tick
+        self.max_tick_seconds = max_tick_seconds
+        self.tick = 0
+        self.fluid = {}  # (x,y,z): level for flowing water; water missing here is a source
+        self._accumulator = 0.0
+        self._queue = []    # heap of (due_tick, seq, pos)
+        self._due = {}      # pos: due tick of its live queue entry
+        self._dormant = {}  # (cx,cz): positions due while their chunk was unloaded
+        self._seq = count()
+        self._touched = None
+        self.rules = {
+            BLOCK_SAND: self._tick_falling,
+            BLOCK_GRAVEL: self._tick_falling,
+            BLOCK_GRASS: self._tick_grass,
+            BLOCK_DIRT: self._tick_dirt,
+            BLOCK_WATER: self._tick_water,
+        }
+
+    def pending(self):
+        return len(self._due)
+
+    def schedule(self, pos, delay=1):
+        """Tick pos after delay ticks; an earlier pending tick for pos wins."""
+        pos = tuple(pos)
+        due = self.tick + max(1, delay)
+        if self._due.get(pos, due + 1) <= due:
+            return
+        self._due[pos] = due
+        heapq.heappush(self._queue, (due, next(self._seq), pos))
+
+    def schedule_around(self, pos, block_type=None):
+        # Schedule pos and its neighbours that have a tick rule, using each block's own delay
+        if block_type is None:
+            block_type = self.terrain.get_block_type(pos)
+        cells = [(pos, block_type)] + [(p, self.terrain.get_block_type(p)) for p in (_offset(pos, d) for d in NEIGHBOURS)]
+        for p, bt in cells:
+            delay = self._delay_for(bt)
+            if delay:
+                self.schedule(p, delay)
+
+    def block_changed(self, pos, block_type):
+        """Called by Terrain for every edit, player-made or simulated."""
+        self.fluid.pop(pos, None)
+        self.schedule_around(pos, block_type)
+
+    def wake_chunk(self, cx, cz):
+        # Resume ticks that came due while the chunk was unloaded
+        for pos in self._dormant.pop((cx, cz), ()):
+            self.schedule(pos)
+
+    def update(self, dt):
+        """Advance the simulation by dt seconds of frame time at the fixed tick rate."""
+        self._touched = set()
+        try:
+            self._accumulator += dt
+            ticks = 0
+            while self._accumulator >= self.tick_interval and ticks < MAX_TICKS_PER_FRAME:
+                self._accumulator -= self.tick_interval
+                self._run_tick()
+                ticks += 1
+            if ticks == MAX_TICKS_PER_FRAME:
+                # Drop the backlog instead of spiralling after a long frame
+                self._accumulator = min(self._accumulator, self.tick_interval)
+        except Exception as e:
+            print(f"Error in BlockTicks.update: {e}")
+        finally:
+            self._remesh_touched()
+
+    def _run_tick(self):
+        self.tick += 1
+        budget = self.max_updates_per_tick
+        deadline = perf_counter() + self.max_tick_seconds
+        # Updates left over when either budget runs out stay queued and run first next tick
+        while self._queue and self._queue[0][0] <= self.tick and budget > 0 and perf_counter() < deadline:
+            due, _, pos = heapq.heappop(self._queue)
+            if self._due.get(pos) != due:
+                continue  # Superseded by an earlier schedule
+            del self._due[pos]
+            key = chunk_coords(pos)
+            if key not in self.terrain.chunks:
+                self._dormant.setdefault(key, set()).add(pos)
+                continue
+            budget -= 1
+            rule = self.rules.get(self.terrain.get_block_type(pos))
+            if rule:
+                rule(pos)
+
+    def _remesh_touched(self):
+        # Catch-up ticks in one frame share a single rebuild per touched chunk
+        touched, self._touched = self._touched, None
+        if touched:
+            self.terrain.remesh_chunks(touched)
+
+    def _delay_for(self, block_type):
+        if block_type in FALLING_BLOCKS:
+            return FALL_DELAY
+        if block_type == BLOCK_WATER:
+            return WATER_FLOW_DELAY
+        if block_type in (BLOCK_GRASS, BLOCK_DIRT):
+            return random.randint(*GRASS_SPREAD_DELAY)
+        return 0
+
+    def _can_edit(self, target, pos):
+        # Rules never write into unloaded chunks; pos waits there until the target's chunk loads
+        key = chunk_coords(target)
+        if key in self.terrain.chunks:
+            return True
+        self._dormant.setdefault(key, set()).add(pos)
+        return False
+
+    def _set(self, pos, block_type):
+        if self._can_edit(pos, pos):
+            self._touched.update(self.terrain.set_block(pos, block_type))
+
+    def _tick_falling(self, pos):
+        below = _offset(pos, (0, -1, 0))
+        if self.terrain.get_block_type(below) == BLOCK_AIR and self._can_edit(below, pos):
+            block_type = self.terrain.get_block_type(pos)
+            self._set(pos, BLOCK_AIR)
+            self._set(below, block_type)
+
+    def _tick_grass(self, pos):
+        # Grass smothered by a block on top dies back to dirt
+        if self.terrain.get_block_type(_offset(pos, (0, 1, 0))) != BLOCK_AIR:
+            self._set(pos, BLOCK_DIRT)
+
+    def _tick_dirt(self, pos):
+        # Uncovered dirt next to grass (one block up, down or sideways) grows grass
+        if self.terrain.get_block_type(_offset(pos, (0, 1, 0))) != BLOCK_AIR:
+            return
+        x, y, z = pos
+        for dx in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if (dx or dz) and self.terrain.get_block_type((x + dx, y + dy, z + dz)) == BLOCK_GRASS:
+                        self._set(pos, BLOCK_GRASS)
+                        return
+
+    def _water_level(self, pos):
+        if self.terrain.get_block_type(pos) != BLOCK_WATER:
+            return 0
+        return self.fluid.get(pos, WATER_SOURCE_LEVEL)
+
+    def _tick_water(self, pos):
+        level = self.fluid.get(pos, WATER_SOURCE_LEVEL)
+        if level < WATER_SOURCE_LEVEL:
+            # Flowing water keeps the level its feeders allow, and dries up without any
+            if self._water_level(_offset(pos, (0, 1, 0))):
+                supplied = WATER_SOURCE_LEVEL - 1
+            else:
+                supplied = max(self._water_level(_offset(pos, d)) for d in SIDES) - 1
+            if supplied <= 0:
+                self._set(pos, BLOCK_AIR)
+                return
+            if supplied != level:
+                self.fluid[pos] = level = supplied
+                self.schedule_around(pos)
+
+        below = _offset(pos, (0, -1, 0))
+        below_type = self.terrain.get_block_type(below)
+        if below_type == BLOCK_AIR:
+            if self._can_edit(below, pos):
+                self._place_water(below, WATER_SOURCE_LEVEL - 1)
+        elif below_type != BLOCK_WATER and level > 1:
+            for d in SIDES:
+                side = _offset(pos, d)
+                if self.terrain.get_block_type(side) == BLOCK_AIR and self._can_edit(side, pos):
+                    self._place_water(side, level - 1)
+
+    def _place_water(self, pos, level):
+        if self._can_edit(pos, pos):
+            self._set(pos, BLOCK_WATER)
+            self.fluid[pos] = level
@@ -1,9 +1,62 @@
 from ursina import Vec3, color
 from ursina.mesh_importer import Mesh
+from utils import MAX_LIGHT
 
-def generate_chunk_mesh(voxel_data, block_colors, default_color=color.green):
+FACE_DIRECTIONS = (
+    ((0, 0, 1), ((0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1))),  # front
+    ((0, 0, -1), ((1, 0, 0), (0, 0, 0), (0, 1, 0), (1, 1, 0))),  # back
+    ((0, 1, 0), ((0, 1, 1), (1, 1, 1), (1, 1, 0), (0, 1, 0))),  # top
+    ((0, -1, 0), ((0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1))),  # bottom
+    ((1, 0, 0), ((1, 0, 1), (1, 0, 0), (1, 1, 0), (1, 1, 1))),  # right
+    ((-1, 0, 0), ((0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0))),  # left
+)
+
+LIGHT_FALLOFF = 0.8    # Brightness multiplier per missing light level
+MIN_BRIGHTNESS = 0.08  # Keep unlit caves from going fully black
+AO_CURVE = (0.45, 0.65, 0.82, 1.0)  # Brightness by number of open cells around a vertex
+
+def _vertex_offsets(normal, corner):
+    # Cells in front of the face touching this vertex: two sides and the diagonal
+    steps = []
+    for axis in range(3):
+        if normal[axis] == 0:
+            step = [0, 0, 0]
+            step[axis] = 1 if corner[axis] else -1
+            steps.append(step)
+    side1 = tuple(normal[i] + steps[0][i] for i in range(3))
+    side2 = tuple(normal[i] + steps[1][i] for i in range(3))
+    diagonal = tuple(normal[i] + steps[0][i] + steps[1][i] for i in range(3))
+    return side1, side2, diagonal
+
+FACE_VERTEX_OFFSETS = {normal: [_vertex_offsets(normal, corner) for corner in face] for normal, face in FACE_DIRECTIONS}
+
+def _vertex_brightness(pos, normal, offsets, is_solid, light_at):
+    """
+    Smooth lighting and ambient occlusion for one face vertex.
+    Averages the light of the open cells around the vertex and darkens it by how many are solid.
+    """
+    x, y, z = pos
+    side1, side2, diagonal = [(x + dx, y + dy, z + dz) for dx, dy, dz in offsets]
+    solid1, solid2 = is_solid(side1), is_solid(side2)
+    solid_diagonal = (solid1 and solid2) or is_solid(diagonal)
+    ao = 0 if solid1 and solid2 else 3 - (solid1 + solid2 + solid_diagonal)
+    brightness = AO_CURVE[ao]
+    if light_at is not None:
+        samples = [light_at((x + normal[0], y + normal[1], z + normal[2]))]
+        for cell, solid in ((side1, solid1), (side2, solid2), (diagonal, solid_diagonal)):
+            if not solid:
+                samples.append(light_at(cell))
+        level = sum(samples) / len(samples)
+        brightness *= max(MIN_BRIGHTNESS, LIGHT_FALLOFF ** (MAX_LIGHT - level))
+    return brightness
+
+def generate_chunk_mesh(voxel_data, block_colors, default_color=color.green, light_at=None, solid_at=None):
     """
     Given a set of (x, y, z) positions and block_colors dict, generate a mesh with only visible faces.
+    light_at is an optional callable returning the light level (0..MAX_LIGHT) of a chunk-local position;
+    it is baked, together with per-vertex ambient occlusion, into the vertex colors.
+    solid_at optionally reports blocks at chunk-local positions outside voxel_data (neighbouring chunks)
+    so occlusion matches across chunk borders.
     Returns a Mesh object suitable for an Entity.
     """
     # Input validation
@@ -12,14 +65,11 @@ def generate_chunk_mesh(voxel_data, block_colors, default_color=color.green):
     if not isinstance(block_colors, dict):
         raise ValueError("block_colors must be a dictionary")
 
-    directions = {
-        Vec3(0, 0, 1): [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],  # front
-        Vec3(0, 0, -1): [(1, 0, 0), (0, 0, 0), (0, 1, 0), (1, 1, 0)],  # back
-        Vec3(0, 1, 0): [(0, 1, 1), (1, 1, 1), (1, 1, 0), (0, 1, 0)],  # top
-        Vec3(0, -1, 0): [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],  # bottom
-        Vec3(1, 0, 0): [(1, 0, 1), (1, 0, 0), (1, 1, 0), (1, 1, 1)],  # right
-        Vec3(-1, 0, 0): [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)],  # left
-    }
+    if solid_at is None:
+        is_solid = voxel_data.__contains__
+    else:
+        is_solid = lambda cell: cell in voxel_data or solid_at(cell)
+
     verts, tris, uvs, colors, normals = [], [], [], [], []
     max_verts = 60000  # Safety: avoid excessive mesh size
 
@@ -27,25 +77,32 @@ def generate_chunk_mesh(voxel_data, block_colors, default_color=color.green):
         # Ensure pos is tuple or Vec3
         try:
             vec_pos = Vec3(*pos) if not isinstance(pos, Vec3) else pos
+            block_pos = tuple(int(v) for v in vec_pos)
         except Exception:
             print(f"Warning: invalid position {pos}, skipping.")
             continue
 
         block_type = voxel_data[pos]
-        for normal, face in directions.items():
-            neighbor = tuple(vec_pos + normal)
+        c = block_colors.get(block_type, default_color)
+        if c is None:
+            print(f"Warning: No color for block_type {block_type}, using default.")
+            c = default_color
+        for normal, face in FACE_DIRECTIONS:
+            neighbor = (block_pos[0] + normal[0], block_pos[1] + normal[1], block_pos[2] + normal[2])
             if neighbor not in voxel_data:  # Only add face if air
                 i = len(verts)
                 face_world = [Vec3(p) + vec_pos for p in face]
                 verts.extend(face_world)
-                tris.extend([i, i+2, i+1, i, i+3, i+2])
+                shade = [_vertex_brightness(block_pos, normal, offsets, is_solid, light_at)
+                         for offsets in FACE_VERTEX_OFFSETS[normal]]
+                # Split the quad along the brighter diagonal so AO interpolates without creases
+                if shade[0] + shade[2] < shade[1] + shade[3]:
+                    tris.extend([i, i+3, i+1, i+1, i+3, i+2])
+                else:
+                    tris.extend([i, i+2, i+1, i, i+3, i+2])
                 uvs.extend([(0, 0), (1, 0), (1, 1), (0, 1)])
-                c = block_colors.get(block_type, default_color)
-                if c is None:
-                    print(f"Warning: No color for block_type {block_type}, using default.")
-                    c = default_color
-                colors.extend([c] * 4)
-                normals.extend([normal] * 4)  # Add normal vector for each vertex
+                colors.extend([color.Color(c[0] * s, c[1] * s, c[2] * s, c[3]) for s in shade])
+                normals.extend([Vec3(normal)] * 4)  # Add normal vector for each vertex
                 if len(verts) > max_verts:
                     print("Warning: chunk mesh too large, truncating.")
                     break
@@ -57,4 +114,4 @@ def generate_chunk_mesh(voxel_data, block_colors, default_color=color.green):
         print(f"Error creating mesh: {e}")
         return None
 
-    return mesh
\ No newline at end of file
+    return mesh
@@ -0,0 +1,213 @@
+from collections import deque
+from utils import CHUNK_SIZE, MAX_LIGHT, LIGHT_MIN_Y, LIGHT_MAX_Y, BLOCK_AIR, block_light_emission, transparent_blocks
+
+NEIGHBOURS = ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1))
+
+def _chunk_key(pos):
+    return (pos[0] // CHUNK_SIZE, pos[2] // CHUNK_SIZE)
+
+def _blocks_light(block_type):
+    return block_type is not None and block_type != BLOCK_AIR and block_type not in transparent_blocks
+
+class LightEngine:
+    """
+    Per-voxel skylight and blocklight, flood-filled with BFS and stored per chunk.
+    Skylight travels straight down at full strength and loses one level per step otherwise;
+    blocklight spreads from emitting blocks. Edits only relight the region the changed light
+    can reach (at most MAX_LIGHT blocks away), never whole chunks.
+    """
+    def __init__(self):
+        self.blocks = {}  # (cx,cz): {(wx,y,wz): block_type} for every non-air block
+        self.sky = {}     # (cx,cz): {(wx,y,wz): level}, dark cells omitted
+        self.block = {}   # (cx,cz): {(wx,y,wz): level}, dark cells omitted
+        self.dirty_chunks = set()  # chunks whose light changed since the last pop_dirty_chunks()
+
+    def is_lit(self, cx, cz):
+        return (cx, cz) in self.sky
+
+    def light_chunk(self, cx, cz, chunk_data):
+        """Compute light for a freshly loaded chunk from its (local pos -> block type) data."""
+        key = (cx, cz)
+        ox, oz = cx * CHUNK_SIZE, cz * CHUNK_SIZE
+        blocks = {}
+        for (bx, by, bz), bt in chunk_data.items():
+            if bt != BLOCK_AIR and LIGHT_MIN_Y <= by <= LIGHT_MAX_Y:
+                blocks[(ox + bx, by, oz + bz)] = bt
+        self.blocks[key] = blocks
+        sky = self.sky[key] = {}
+        block = self.block[key] = {}
+
+        sky_queue, block_queue = deque(), deque()
+        for bx in range(CHUNK_SIZE):
+            for bz in range(CHUNK_SIZE):
+                # Sunlight falls down each column until it hits the first solid block
+                for y in range(LIGHT_MAX_Y, LIGHT_MIN_Y - 1, -1):
+                    pos = (ox + bx, y, oz + bz)
+                    if _blocks_light(blocks.get(pos)):
+                        break
+                    sky[pos] = MAX_LIGHT
+                    sky_queue.append(pos)
+        for pos, bt in blocks.items():
+            emission = block_light_emission.get(bt, 0)
+            if emission:
+                block[pos] = emission
+                block_queue.append(pos)
+
+        # Let light already present in loaded neighbours flow across the shared borders
+        borders = (
+            ((cx - 1, cz), 0, ox - 1), ((cx + 1, cz), 0, ox + CHUNK_SIZE),
+            ((cx, cz - 1), 2, oz - 1), ((cx, cz + 1), 2, oz + CHUNK_SIZE),
+        )
+        for neighbour, axis, edge in borders:
+            for channel, queue in ((self.sky, sky_queue), (self.block, block_queue)):
+                layer = channel.get(neighbour)
+                if layer:
+                    queue.extend(pos for pos in layer if pos[axis] == edge)
+
+        self.dirty_chunks.add(key)
+        self._propagate(self.sky, sky_queue, True)
+        self._propagate(self.block, block_queue, False)
+
+    def unload_chunk(self, cx, cz):
+        key = (cx, cz)
+        self.blocks.pop(key, None)
+        self.sky.pop(key, None)
+        self.block.pop(key, None)
+        self.dirty_chunks.discard(key)
+
+    def set_block(self, pos, block_type):
+        """Record a block edit and incrementally relight around it."""
+        pos = tuple(int(v) for v in pos[:3])
+        if not LIGHT_MIN_Y <= pos[1] <= LIGHT_MAX_Y:
+            return
+        key = _chunk_key(pos)
+        blocks = self.blocks.get(key)
+        if blocks is None:
+            return  # Not loaded yet; light_chunk() will see the edit
+        old_type = blocks.pop(pos, BLOCK_AIR)
+        if block_type != BLOCK_AIR:
+            blocks[pos] = block_type
+        opaque = _blocks_light(block_type)
+        emission = block_light_emission.get(block_type, 0)
+        if _blocks_light(old_type) == opaque and block_light_emission.get(old_type, 0) == emission:
+            return  # Light passes through (or stops at) the cell exactly as before
+        self.dirty_chunks.add(key)
+
+        for channel, sky in ((self.sky, True), (self.block, False)):
+            layer = channel[key]
+            removal = deque()
+            old_level = layer.pop(pos, 0)
+            if old_level:
+                removal.append((pos, old_level))
+            relight = self._remove(channel, removal, sky)
+            if not opaque:
+                # The cell lets light through now: pull it in from the surrounding cells
+                relight.extend(self._neighbours(pos))
+                if sky and pos[1] == LIGHT_MAX_Y:
+                    layer[pos] = MAX_LIGHT
+                    relight.append(pos)
+            if not sky and emission:
+                layer[pos] = max(layer.get(pos, 0), emission)
+                relight.append(pos)
+            self._propagate(channel, relight, sky)
+
+    def light_at(self, pos):
+        """Combined sky/block light level at a world position (full light outside the lit region)."""
+        x, y, z = pos
+        if y > LIGHT_MAX_Y:
+            return MAX_LIGHT
+        if y < LIGHT_MIN_Y:
+            return 0
+        key = (x // CHUNK_SIZE, z // CHUNK_SIZE)
+        sky = self.sky.get(key)
+        if sky is None:
+            return MAX_LIGHT
+        return max(sky.get(pos, 0), self.block[key].get(pos, 0))
+
+    def is_solid(self, pos):
+        """True if a loaded chunk holds a block at this world position."""
+        blocks = self.blocks.get(_chunk_key(pos))
+        return blocks is not None and pos in blocks
+
+    def chunk_light_sampler(self, cx, cz):
+        """Returns a light_at() taking chunk-local positions, as expected by generate_chunk_mesh."""
+        return self._local_sampler(cx, cz, self.light_at)
+
+    def chunk_solid_sampler(self, cx, cz):
+        """Returns a solid_at() taking chunk-local positions, as expected by generate_chunk_mesh."""
+        return self._local_sampler(cx, cz, self.is_solid)
+
+    def _local_sampler(self, cx, cz, lookup):
+        ox, oz = cx * CHUNK_SIZE, cz * CHUNK_SIZE
+        def sample(local_pos):
+            bx, by, bz = local_pos
+            return lookup((ox + bx, by, oz + bz))
+        return sample
+
+    def pop_dirty_chunks(self):
+        dirty, self.dirty_chunks = self.dirty_chunks, set()
+        return dirty
+
+    def _neighbours(self, pos):
+        x, y, z = pos
+        for dx, dy, dz in NEIGHBOURS:
+            if LIGHT_MIN_Y <= y + dy <= LIGHT_MAX_Y:
+                yield (x + dx, y + dy, z + dz)
+
+    def _propagate(self, channel, queue, sky):
+        # BFS: raise every reachable transparent cell to (source level - 1)
+        blocks = self.blocks
+        dirty = self.dirty_chunks
+        while queue:
+            pos = queue.popleft()
+            x, y, z = pos
+            layer = channel.get((x // CHUNK_SIZE, z // CHUNK_SIZE))
+            level = layer.get(pos, 0) if layer is not None else 0
+            if level <= 1:
+                continue
+            for dx, dy, dz in NEIGHBOURS:
+                ny = y + dy
+                if ny < LIGHT_MIN_Y or ny > LIGHT_MAX_Y:
+                    continue
+                nx, nz = x + dx, z + dz
+                key = (nx // CHUNK_SIZE, nz // CHUNK_SIZE)
+                n_layer = channel.get(key)
+                n = (nx, ny, nz)
+                if n_layer is None or _blocks_light(blocks[key].get(n)):
+                    continue
+                new = MAX_LIGHT if sky and dy == -1 and level == MAX_LIGHT else level - 1
+                if n_layer.get(n, 0) < new:
+                    n_layer[n] = new
+                    dirty.add(key)
+                    queue.append(n)
+
+    def _remove(self, channel, queue, sky):
+        # Reverse BFS: darken every cell that was lit by the removed (pos, level) entries.
+        # Returns the brighter boundary cells that must re-propagate into the darkened area.
+        blocks = self.blocks
+        dirty = self.dirty_chunks
+        relight = deque()
+        while queue:
+            (x, y, z), level = queue.popleft()
+            for dx, dy, dz in NEIGHBOURS:
+                ny = y + dy
+                if ny < LIGHT_MIN_Y or ny > LIGHT_MAX_Y:
+                    continue
+                nx, nz = x + dx, z + dz
+                key = (nx // CHUNK_SIZE, nz // CHUNK_SIZE)
+                n_layer = channel.get(key)
+                if n_layer is None:
+                    continue
+                n = (nx, ny, nz)
+                n_level = n_layer.get(n, 0)
+                if n_level == 0:
+                    continue
+                if _blocks_light(blocks[key].get(n)):
+                    relight.append(n)  # Lit opaque blocks are emitters; they keep their own light
+                elif n_level < level or (sky and dy == -1 and level == MAX_LIGHT):
+                    del n_layer[n]
+                    dirty.add(key)
+                    queue.append((n, n_level))
+                else:
+                    relight.append(n)
+        return relight
@@ -1,4 +1,4 @@
-from ursina import Ursina, Sky, application, window, Text, DirectionalLight, AmbientLight, color, Entity, raycast, camera, Vec3
+from ursina import Ursina, Sky, application, window, Text, DirectionalLight, AmbientLight, color, Entity, raycast, camera, Vec3, time
 from player import Player
 from terrain import Terrain
 from input_handler import handle_input
@@ -48,6 +48,10 @@ def update():
             terrain.update()
         except Exception as e:
             print(f"Error updating terrain: {e}")
+        try:
+            terrain.block_ticks.update(time.dt)
+        except Exception as e:
+            print(f"Error updating block ticks: {e}")
     if player:
         try:
             player.update()
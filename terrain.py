@@ -1,6 +1,8 @@
 from ursina import camera
-from utils import sample_height, compute_strata, chunk_coords, CHUNK_SIZE, TERRAIN_RADIUS, block_colors
+from utils import sample_height, compute_strata, chunk_coords, block_in_chunk_coords, CHUNK_SIZE, TERRAIN_RADIUS, block_colors, BLOCK_AIR
 from voxel_chunk import Chunk
+from lighting import LightEngine
+from block_ticks import BlockTicks
 
 class Terrain:
     def __init__(self, player):
@@ -12,6 +14,8 @@ class Terrain:
         self.frustum_culling_enabled = False
         self.max_loaded_chunks = 32  # Limit to avoid memory leaks
         self.unload_distance = 3     # Chunks farther than this from player will be unloaded
+        self.lighting = LightEngine()
+        self.block_ticks = BlockTicks(self)
 
     def get_chunk_data(self, cx, cz):
         chunk_data = {}
@@ -38,22 +42,46 @@ class Terrain:
     def request_chunk(self, cx, cz):
         chunk_data = self.get_chunk_data(cx, cz)
         try:
+            if not self.lighting.is_lit(cx, cz):
+                self.lighting.light_chunk(cx, cz, chunk_data)
+            light_at = self.lighting.chunk_light_sampler(cx, cz)
+            solid_at = self.lighting.chunk_solid_sampler(cx, cz)
             if (cx, cz) in self.chunks:
-                self.chunks[(cx, cz)].update_mesh(chunk_data)
+                self.chunks[(cx, cz)].update_mesh(chunk_data, light_at, solid_at)
             else:
-                chunk = Chunk(cx, cz, chunk_data)
+                chunk = Chunk(cx, cz, chunk_data, light_at, solid_at)
                 self.chunks[(cx, cz)] = chunk
+                self.block_ticks.wake_chunk(cx, cz)
         except Exception as e:
             print(f"Error in request_chunk: {e}")
 
+    def remesh_chunks(self, keys=()):
+        # Rebuild each loaded chunk in keys, plus any whose light changed, exactly once
+        try:
+            for key in set(keys) | self.lighting.pop_dirty_chunks():
+                if key in self.chunks:
+                    self.request_chunk(*key)
+        except Exception as e:
+            print(f"Error in remesh_chunks: {e}")
+
     def update(self):
         try:
             pg = self.player.grid_pos()
             player_chunk = chunk_coords(pg)
-            # Load nearby chunks
-            for cx in range(player_chunk[0] - 1, player_chunk[0] + 2):
-                for cz in range(player_chunk[1] - 1, player_chunk[1] + 2):
-                    self.request_chunk(cx, cz)
+            nearby = [(cx, cz)
+                      for cx in range(player_chunk[0] - 1, player_chunk[0] + 2)
+                      for cz in range(player_chunk[1] - 1, player_chunk[1] + 2)]
+            # Light new chunks before meshing so light crossing their borders is already in place
+            for cx, cz in nearby:
+                if not self.lighting.is_lit(cx, cz):
+                    self.lighting.light_chunk(cx, cz, self.get_chunk_data(cx, cz))
+            # Load missing chunks; built chunks are only rebuilt when their light changed
+            dirty = self.lighting.pop_dirty_chunks()
+            for key in nearby:
+                if key not in self.chunks:
+                    self.request_chunk(*key)
+                    dirty.discard(key)
+            self.remesh_chunks(dirty)
             # Unload far chunks
             self._unload_far_chunks(player_chunk)
         except Exception as e:
@@ -68,6 +96,7 @@ class Terrain:
                     to_unload.append((cx, cz))
             for key in to_unload:
                 chunk = self.chunks.pop(key)
+                self.lighting.unload_chunk(*key)
                 try:
                     chunk.hide()
                     del chunk
@@ -84,10 +113,8 @@ class Terrain:
             print(f"Invalid block_type {block_type}, must be int")
             return
         print("Placing block at:", pos)
-        self.placed[pos] = block_type
         try:
-            cx, cz = chunk_coords(pos)
-            self.request_chunk(cx, cz)
+            self.remesh_chunks(self.set_block(pos, block_type))
         except Exception as e:
             print(f"Error placing block {pos}: {e}")
 
@@ -96,13 +123,35 @@ class Terrain:
             print(f"Invalid mine position: {pos}")
             return
         print("Mining block at:", pos)
-        self.mined.add(pos)
         try:
-            cx, cz = chunk_coords(pos)
-            self.request_chunk(cx, cz)
+            self.remesh_chunks(self.set_block(pos, BLOCK_AIR))
         except Exception as e:
             print(f"Error mining block {pos}: {e}")
 
+    def set_block(self, pos, block_type):
+        """
+        Apply one edit to the world data, light and block ticks without rebuilding any mesh.
+        Returns the (cx, cz) keys of every chunk whose mesh the edit affects so callers can batch remeshing.
+        """
+        pos = tuple(pos)
+        if block_type == BLOCK_AIR:
+            self.placed.pop(pos, None)
+            self.mined.add(pos)
+        else:
+            self.mined.discard(pos)
+            self.placed[pos] = block_type
+        self.lighting.set_block(pos, block_type)
+        self.block_ticks.block_changed(pos, block_type)
+        return self._affected_chunks(pos)
+
+    def _affected_chunks(self, pos):
+        # The edited chunk, plus the neighbours (diagonal too at corners) whose border occlusion reads this cell
+        cx, cz = chunk_coords(pos)
+        bx, _, bz = block_in_chunk_coords(pos)
+        dxs = [0] + ([-1] if bx == 0 else [1] if bx == CHUNK_SIZE - 1 else [])
+        dzs = [0] + ([-1] if bz == 0 else [1] if bz == CHUNK_SIZE - 1 else [])
+        return [(cx + dx, cz + dz) for dx in dxs for dz in dzs]
+
     def get_block_type(self, pos):
         # Validate position
         if not isinstance(pos, (tuple, list)) or len(pos) < 3:
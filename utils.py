@@ -7,11 +7,19 @@ BLOCK_AIR   = 0
 BLOCK_GRASS = 1
 BLOCK_DIRT  = 2
 BLOCK_STONE = 3
+BLOCK_LAMP  = 4
+BLOCK_SAND  = 5
+BLOCK_GRAVEL = 6
+BLOCK_WATER = 7
 
 block_types = [
     ("Grass", BLOCK_GRASS),
     ("Dirt", BLOCK_DIRT),
     ("Stone", BLOCK_STONE),
+    ("Lamp", BLOCK_LAMP),
+    ("Sand", BLOCK_SAND),
+    ("Gravel", BLOCK_GRAVEL),
+    ("Water", BLOCK_WATER),
 ]
 
 block_colors = {
@@ -19,6 +27,20 @@ block_colors = {
     BLOCK_GRASS: color.rgb32(34, 139, 34),
     BLOCK_DIRT:  color.rgb32(139, 69, 19),
     BLOCK_STONE: color.rgb32(100, 100, 100),
+    BLOCK_LAMP:  color.rgb32(255, 214, 120),
+    BLOCK_SAND:  color.rgb32(219, 203, 150),
+    BLOCK_GRAVEL: color.rgb32(136, 126, 122),
+    BLOCK_WATER: color.rgba32(50, 100, 220, 180),
+}
+
+# Block light emitted by each block type (0..MAX_LIGHT); missing types emit nothing
+block_light_emission = {
+    BLOCK_LAMP: 14,
+}
+
+# Block types that light passes through like air (they are still meshed as blocks)
+transparent_blocks = {
+    BLOCK_WATER,
 }
 
 # Validate block_types and block_colors at import
@@ -40,6 +62,13 @@ MAX_HEIGHT = 5
 TERRAIN_RADIUS = 8  # in blocks, not chunks
 CHUNK_SIZE = 8
 VISIBLE_RADIUS = 8  # blocks
+MAX_LIGHT = 15
+LIGHT_MIN_Y = 0     # lowest layer that is meshed and lit
+LIGHT_MAX_Y = 31    # everything above is treated as open sky
+TICK_RATE = 20                     # Block ticks per second, independent of frame rate
+MAX_TICKS_PER_FRAME = 4            # Catch-up limit after a slow frame
+MAX_BLOCK_UPDATES_PER_TICK = 64    # Block updates beyond this roll over to the next tick
+MAX_TICK_SECONDS = 0.003           # Time budget per tick; remaining updates roll over as well
 
 try:
     noise = OpenSimplex(seed=42)
@@ -3,25 +3,31 @@ from chunk_mesh import generate_chunk_mesh
 from utils import block_colors  # <-- Import block_colors
 
 class Chunk(Entity):
-    def __init__(self, cx, cz, chunk_data):
+    def __init__(self, cx, cz, chunk_data, light_at=None, solid_at=None):
         Entity.__init__(self)
         self.cx = cx
         self.cz = cz
         self.chunk_data = chunk_data
+        self.light_at = light_at  # Chunk-local light sampler baked into vertex colors
+        self.solid_at = solid_at  # Chunk-local solidity across borders, for ambient occlusion
         self.mesh = None
         self.collider = None
         self.visible = True  # For chunk unloading
-        self.update_mesh(chunk_data)
+        self.update_mesh(chunk_data, light_at, solid_at)
 
-    def update_mesh(self, chunk_data):
+    def update_mesh(self, chunk_data, light_at=None, solid_at=None):
         # Input validation
         if not isinstance(chunk_data, dict):
             print(f"Warning: chunk_data is not a dict for chunk ({self.cx}, {self.cz})")
             chunk_data = {}
         self.chunk_data = chunk_data
+        if light_at is not None:
+            self.light_at = light_at
+        if solid_at is not None:
+            self.solid_at = solid_at
 
         try:
-            mesh = generate_chunk_mesh(self.chunk_data, block_colors)
+            mesh = generate_chunk_mesh(self.chunk_data, block_colors, light_at=self.light_at, solid_at=self.solid_at)
             if mesh is None:
                 print(f"Warning: Mesh generation failed for chunk ({self.cx}, {self.cz})")
                 self.model = None